@@ -1,4 +1,5 @@
 import os
+import pytest
 import pandas as pd
 from datacura.visualization.auto_visualizer import AutoVisualizer, DomainRuleEngine
 
@@ -24,3 +25,129 @@ def test_visualization_export(tmp_path):
     vis.visualize(export=True, output_dir=tmp_path)
     files = list(tmp_path.iterdir())
     assert len(files) > 0
+
+def test_domain_rules_unique_count_threshold():
+    engine = DomainRuleEngine("generic")
+    assert engine.suggest_chart("grades", "categorical", 5) == ["bar", "pie"]
+    assert engine.suggest_chart("grades", "categorical", 50) == ["bar"]
+    assert DomainRuleEngine("unknown").suggest_chart("scores", "numeric") == ["histogram", "boxplot"]
+
+def test_optimize_dtypes():
+    df = pd.DataFrame({
+        "scores": [50, 60, 70, 80, 90, 100],
+        "ratio": [0.5, 0.25, 0.75, 1.0, 0.5, 0.25],
+        "grades": ["A", "B", "A", "B", "A", "A"]
+    })
+    vis = AutoVisualizer(df, config={"optimize_dtypes": True})
+    assert vis.df["scores"].dtype == "int8"
+    assert vis.df["ratio"].dtype == "float32"
+    assert vis.df["grades"].dtype == "category"
+    assert df["scores"].dtype == "int64"
+    assert vis.detect_dtype("scores") == "numeric"
+    assert vis.detect_dtype("grades") == "categorical"
+
+def test_boxplot_stats():
+    df = pd.DataFrame({"scores": [1, 2, 3, 4, 100, None]})
+    stats = AutoVisualizer(df)._boxplot_stats("scores")
+    assert stats["med"] == 3
+    assert stats["whishi"] == 4
+    assert list(stats["fliers"]) == [100]
+
+def test_parallel_visualization_export(tmp_path):
+    df = pd.DataFrame({
+        "scores": [50, 60, 70],
+        "grades": ["A", "B", "C"]
+    })
+    vis = AutoVisualizer(df, domain="education", config={"max_charts_per_column": 1, "parallel": True, "max_workers": 2})
+    vis.visualize(export=True, output_dir=tmp_path)
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["grades_bar.png", "scores_histogram.png"]
+
+def test_prepare_categorical_data():
+    df = pd.DataFrame({"grades": list("ABCDEFGH") + ["A", "A", "B"]})
+    vis = AutoVisualizer(df)
+    data, has_other = vis._prepare_categorical_data("grades", 4)
+    assert has_other
+    assert list(data.index) == ["A", "B", "C", "Other"]
+    assert data["Other"] == 5
+    assert vis._prepare_categorical_data("grades", 20)[0] is vis._value_counts("grades")
+
+def test_constant_and_empty_columns_skipped(tmp_path):
+    df = pd.DataFrame({
+        "scores": [50, 60, 70],
+        "constant": [1, 1, 1],
+        "empty": [None, None, None],
+        "grades": ["A", "A", "A"]
+    })
+    vis = AutoVisualizer(df, config={"max_charts_per_column": 1})
+    vis.visualize(export=True, output_dir=tmp_path)
+    assert [f.name for f in tmp_path.iterdir()] == ["scores_histogram.png"]
+
+def test_sample_positions():
+    vis = AutoVisualizer(pd.DataFrame({"scores": [1, 2]}), config={"max_plot_points": 10})
+    assert vis._sample_positions(10) is None
+    positions = vis._sample_positions(100)
+    assert len(positions) == 10
+    assert list(positions) == sorted(set(positions))
+
+def test_value_counts_from_codes_matches_pandas():
+    pytest.importorskip("numba")
+    df = pd.DataFrame({
+        "grades": ["B", "A", None, "C", "A", "B", "A"],
+        "levels": pd.Categorical(["x", "y", "x", "x", None, "y", "x"], categories=["x", "y", "z"])
+    })
+    numba_vis = AutoVisualizer(df, config={"numba_threshold": 0})
+    pandas_vis = AutoVisualizer(df, config={"numba_threshold": len(df)})
+    for col in df.columns:
+        pd.testing.assert_series_equal(numba_vis._value_counts(col), pandas_vis._value_counts(col))
+
+def test_bar_and_pie_export(tmp_path):
+    df = pd.DataFrame({"grades": ["A", "B", "A", "C"]})
+    vis = AutoVisualizer(df, domain="generic")
+    vis.visualize(export=True, output_dir=tmp_path)
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["grades_bar.png", "grades_pie.png"]
+
+def test_empty_dataframe_skipped(tmp_path):
+    AutoVisualizer(pd.DataFrame(index=range(3))).visualize(export=True, output_dir=tmp_path)
+    AutoVisualizer(pd.DataFrame({"scores": []})).visualize(export=True, output_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+def test_unused_categories_ignored(tmp_path):
+    letters = list("abcdefghijklmnopqrstuvwxyz")
+    df = pd.DataFrame({
+        "cat": pd.Categorical(["a", "b", "c", "a"], categories=letters),
+        "constant": pd.Categorical(["a"] * 4, categories=["a", "b", "c"]),
+        "empty": pd.Categorical([None] * 4, categories=["a", "b", "c"])
+    })
+    vis = AutoVisualizer(df, domain="generic")
+    assert list(vis._value_counts("cat")) == [2, 1, 1]
+    vis.visualize(export=True, output_dir=tmp_path)
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["cat_bar.png", "cat_pie.png"]
+
+def test_datashader_backend_export(tmp_path):
+    pytest.importorskip("datashader")
+    df = pd.DataFrame({"yield": range(200), "rainfall": [i % 17 for i in range(200)]})
+    vis = AutoVisualizer(df, domain="agriculture", config={"backend": "datashader", "datashader_threshold": 100})
+    assert vis._use_datashader()
+    vis.visualize(export=True, output_dir=tmp_path)
+    assert sorted(f.name for f in tmp_path.iterdir()) == [
+        "rainfall_line.png", "rainfall_scatter.png", "yield_line.png", "yield_scatter.png"
+    ]
+
+def test_column_frame_adds_scatter_x_only_when_needed():
+    df = pd.DataFrame({"c0": [1, 2, 3], "c1": [4, 5, 6], "label": ["a", "b", "c"]})
+    for domain, expected in [("generic", ["c1"]), ("agriculture", ["c0", "c1"])]:
+        vis = AutoVisualizer(df, domain=domain)
+        vis._numeric_cols = vis._detect_numeric_columns()
+        vis._numeric_columns = ["c0", "c1"]
+        assert list(vis._column_frame("c1", 3).columns) == expected
+        assert list(vis._column_frame("label", None).columns) == ["label"]
+
+def test_png_export_keeps_dpi(tmp_path):
+    from PIL import Image
+    df = pd.DataFrame({"scores": [50, 60, 70]})
+    for io_workers in (0, 2):
+        out = tmp_path / str(io_workers)
+        AutoVisualizer(df, config={"dpi": 200, "io_workers": io_workers}).visualize(export=True, output_dir=out)
+        with Image.open(out / "scores_histogram.png") as im:
+            assert im.size == (2000, 1200)
+            assert tuple(round(v) for v in im.info["dpi"]) == (200, 200)
@@ -9,212 +9,624 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional
 
+# datashader is an optional dependency, imported only when that backend is selected
+ds = None
+tf = None
+
 # Setup logging
 logger = logging.getLogger("AutoVisualizer")
-logger.setLevel(logging.DEBUG)
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+if not logger.handlers:
+    # Module reloads must not stack up handlers and duplicate every message
+    logger.setLevel(logging.DEBUG)
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+
+def _import_datashader() -> bool:
+    """Import datashader on first use; returns False if it is not installed"""
+    global ds, tf
+    if ds is None:
+        try:
+            import datashader
+            import datashader.transfer_functions
+        except ImportError:
+            return False
+        ds, tf = datashader, datashader.transfer_functions
+    return True
+
+
+def _count_codes_py(codes: np.ndarray, num_categories: int) -> np.ndarray:
+    """Count occurrences of each integer code in one linear pass, ignoring -1 (missing)"""
+    counts = np.zeros(num_categories, dtype=np.int64)
+    for code in codes:
+        if code >= 0:
+            counts[code] += 1
+    return counts
+
+
+_count_codes = None  # Compiled on first use by _get_count_codes(); False if numba is missing
+
+
+def _get_count_codes():
+    """Return the numba-compiled _count_codes_py, or None if numba is not installed"""
+    global _count_codes
+    if _count_codes is None:
+        try:
+            from numba import njit  # numba is an optional dependency
+        except ImportError:
+            _count_codes = False
+        else:
+            _count_codes = njit(cache=True)(_count_codes_py)
+    return _count_codes or None
+
+
+# Chart title templates, formatted with the column name (and x column for scatter plots)
+_CHART_TITLES = {
+    "histogram": "Histogram of {col}",
+    "boxplot": "Boxplot of {col}",
+    "bar": "Bar chart of {col}",
+    "pie": "Pie chart of {col}",
+    "line": "Line chart of {col}",
+    "scatter": "Scatter plot of {x_col} vs {col}",
+}
+
+
+# Chart rules per domain. Categorical suggestions depend on the number of
+# unique values: at or under the threshold the "under" list is used.
+_DOMAIN_RULES: Dict[str, Dict[str, Any]] = {
+    "generic": {
+        "numeric": ["histogram", "boxplot"],
+        "categorical_threshold": 10,
+        "categorical_under": ["bar", "pie"],
+        "categorical_over": ["bar"],
+    },
+    "education": {
+        "numeric": ["histogram", "line"],
+        "categorical_threshold": 15,
+        "categorical_under": ["bar"],
+        "categorical_over": ["bar"],
+    },
+    "supermarket": {
+        "numeric": ["line", "bar"],
+        "categorical_threshold": 8,
+        "categorical_under": ["bar", "pie"],
+        "categorical_over": ["bar"],
+    },
+    "finance": {
+        "numeric": ["line", "histogram"],
+        "categorical_threshold": 12,
+        "categorical_under": ["bar"],
+        "categorical_over": ["bar"],
+    },
+    "healthcare": {
+        "numeric": ["line", "boxplot"],
+        "categorical_threshold": 7,
+        "categorical_under": ["bar", "pie"],
+        "categorical_over": ["bar"],
+    },
+    "agriculture": {
+        "numeric": ["line", "scatter"],
+        "categorical_threshold": 15,
+        "categorical_under": ["bar"],
+        "categorical_over": ["bar"],
+    },
+    "logistics": {
+        "numeric": ["line", "bar"],
+        "categorical_threshold": 6,
+        "categorical_under": ["bar", "pie"],
+        "categorical_over": ["bar"],
+    }
+}
 
 
 class DomainRuleEngine:
     def __init__(self, domain: str = "generic"):
         self.domain = domain
+        self.rules = _DOMAIN_RULES.get(domain, _DOMAIN_RULES["generic"])
 
-    def suggest_chart(self, column: str, dtype: str, unique_count: int) -> List[str]:
-        domain_rules = {
-            "generic": {
-                "numeric": ["histogram", "boxplot"],
-                "categorical": ["bar", "pie"] if unique_count <= 10 else ["bar"]
-            },
-            "education": {
-                "numeric": ["histogram", "line"],
-                "categorical": ["bar"] if unique_count <= 15 else ["bar"]
-            },
-            "supermarket": {
-                "numeric": ["line", "bar"],
-                "categorical": ["bar", "pie"] if unique_count <= 8 else ["bar"]
-            },
-            "finance": {
-                "numeric": ["line", "histogram"],
-                "categorical": ["bar"] if unique_count <= 12 else ["bar"]
-            },
-            "healthcare": {
-                "numeric": ["line", "boxplot"],
-                "categorical": ["bar", "pie"] if unique_count <= 7 else ["bar"]
-            },
-            "agriculture": {
-                "numeric": ["line", "scatter"],
-                "categorical": ["bar"] if unique_count <= 15 else ["bar"]
-            },
-            "logistics": {
-                "numeric": ["line", "bar"],
-                "categorical": ["bar", "pie"] if unique_count <= 6 else ["bar"]
-            }
-        }
-        return domain_rules.get(self.domain, domain_rules["generic"]).get(dtype, ["bar"])
+    def suggest_chart(self, column: str, dtype: str, unique_count: Optional[int] = None) -> List[str]:
+        if dtype == "categorical":
+            # Without a unique count we can't tell if a pie chart is readable
+            if unique_count is not None and unique_count <= self.rules["categorical_threshold"]:
+                return list(self.rules["categorical_under"])
+            return list(self.rules["categorical_over"])
+        return list(self.rules.get(dtype, ["bar"]))
 
 
 class AutoVisualizer:
     def __init__(self, df: pd.DataFrame, domain: str = "generic", config: Dict[str, Any] = None):
-        self.df = df.copy()
+        # Keep a reference rather than a copy; visualize() only reads from
+        # the frame, so callers must not mutate it while charts are drawn.
+        self.df = df
         self.domain_engine = DomainRuleEngine(domain)
+        self._numeric_cols = None  # Filled once per visualize() call
+        self._numeric_columns = []  # Numeric columns in frame order, for picking scatter x-axes
+        self._num_cols = None
+        self._fig = None  # Figure and axes reused across charts, see _get_axes()
+        self._ax = None
+        self._value_counts_cache = {}  # column -> value_counts()
+        self._io_pool = None  # Background PNG writer, see _background_writes()
+        self._pending_writes = {}
         default_config = {
             "max_charts_per_column": 2, 
             "export_format": "png",
             "max_categories": 20,  # Maximum categories to show in categorical charts
             "figsize_width_multiplier": 0.5,  # Width multiplier for figure size
-            "dpi": 100  # Resolution for exported images
+            "dpi": 100,  # Resolution for exported images
+            "optimize_dtypes": False,  # Downcast columns to smaller dtypes before plotting
+            "category_ratio": 0.5,  # Max unique/rows ratio for converting text columns to category
+            "backend": "matplotlib",  # "matplotlib" or "datashader" for rasterized line/scatter charts
+            "datashader_threshold": 50_000,  # Minimum rows before the datashader backend is used
+            "raster_size": (800, 600),  # Canvas size in pixels for rasterized charts
+            "numba_threshold": 1_000_000,  # Rows before categorical counts use the numba kernel, if installed
+            "max_plot_points": 200_000,  # Rows sampled for matplotlib line/scatter charts, None to plot all
+            "io_workers": 2,  # Threads writing PNG exports in the background, 0 to write inline
+            "parallel": False,  # Render columns in a process pool
+            "max_workers": None  # Worker processes for parallel rendering, defaults to os.cpu_count()
         }
         self.config = {**default_config, **(config if config else {})}
 
+        if self.config["backend"] == "datashader" and not _import_datashader():
+            logger.warning("datashader is not installed, falling back to matplotlib backend")
+
+        if self.config["optimize_dtypes"]:
+            self.df = self._optimize_dtypes(self.df)
+
+    def _optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of df with numeric columns downcast and low-cardinality text as category"""
+        df = df.copy()
+        num_rows = len(df)
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                df[col] = pd.to_numeric(series, downcast="integer")
+            elif pd.api.types.is_float_dtype(series):
+                df[col] = pd.to_numeric(series, downcast="float")
+            elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                if num_rows and series.nunique() / num_rows < self.config["category_ratio"]:
+                    df[col] = series.astype("category")
+        logger.debug(f"Optimized dtypes: {df.dtypes.value_counts().to_dict()}")
+        return df
+
+    def _detect_numeric_columns(self) -> set:
+        """Classify every column in one pass over the frame's dtypes"""
+        return {col for col, dtype in self.df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)}
+
     def detect_dtype(self, column: str) -> str:
+        if self._numeric_cols is not None:
+            return "numeric" if column in self._numeric_cols else "categorical"
         if pd.api.types.is_numeric_dtype(self.df[column]):
             return "numeric"
         return "categorical"
 
+    def _value_counts(self, column: str) -> pd.Series:
+        """Return value_counts for a column, hashing it at most once per visualize() call"""
+        if column not in self._value_counts_cache:
+            series = self.df[column]
+            count_codes = _get_count_codes() if len(series) > self.config["numba_threshold"] else None
+            if count_codes is not None:
+                self._value_counts_cache[column] = self._value_counts_from_codes(series, count_codes)
+            else:
+                value_counts = series.value_counts()
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    # Categoricals also report declared categories that never occur
+                    value_counts = value_counts[value_counts > 0]
+                self._value_counts_cache[column] = value_counts
+        return self._value_counts_cache[column]
+
+    def _value_counts_from_codes(self, series: pd.Series, count_codes) -> pd.Series:
+        """value_counts equivalent that counts integer codes with the numba kernel"""
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+        if categorical:
+            codes, num_uniques = series.cat.codes.to_numpy(), len(series.cat.categories)
+        else:
+            codes, uniques = pd.factorize(series)
+            num_uniques = len(uniques)
+        counts = count_codes(codes, num_uniques)
+        # Stable sort keeps ties in the same order as value_counts; zero counts
+        # (unused categories) are dropped just like in _value_counts
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        if categorical:
+            index = pd.CategoricalIndex(pd.Categorical.from_codes(order, dtype=series.dtype), name=series.name)
+        else:
+            index = pd.Index(uniques[order], name=series.name)
+        return pd.Series(counts[order], index=index, name="count")
+
     def _prepare_categorical_data(self, column: str, max_categories: Optional[int] = None):
         """Prepare categorical data, potentially limiting to top categories"""
-        value_counts = self.df[column].value_counts()
+        value_counts = self._value_counts(column)
         
         if max_categories and len(value_counts) > max_categories:
-            # Keep top N-1 categories and group the rest as "Other"
-            top_categories = value_counts.head(max_categories - 1)
-            other_count = value_counts.tail(len(value_counts) - (max_categories - 1)).sum()
-            
-            # Create new series with top categories and "Other"
-            new_series = top_categories.copy()
-            new_series["Other"] = other_count
+            # Keep top N-1 categories and group the rest as "Other". value_counts
+            # is sorted, so this is a slice and one sum over the counts array
+            counts = value_counts.to_numpy()
+            top = max_categories - 1
+            index = pd.Index(list(value_counts.index[:top]) + ["Other"], name=value_counts.index.name)
+            new_series = pd.Series(np.append(counts[:top], counts[top:].sum()),
+                                   index=index, name=value_counts.name)
             
             return new_series, True
         return value_counts, False
 
+    def _numeric_values(self, column: str) -> np.ndarray:
+        """Return the non-null values of a numeric column as a plain NumPy array"""
+        series = self.df[column]
+        if series.hasnans:
+            series = series.dropna()
+        arr = series.to_numpy()
+        if arr.dtype.kind not in "iuf":
+            # Booleans and nullable extension dtypes
+            arr = arr.astype(np.float64)
+        return arr
+
+    def _float_values(self, column: str) -> np.ndarray:
+        """Return a numeric column as a float array with NaN for missing values"""
+        return self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _boxplot_stats(self, column: str) -> Optional[Dict[str, Any]]:
+        """Compute box plot summary statistics in a single NumPy pass for Axes.bxp"""
+        arr = self._numeric_values(column)
+        if arr.size == 0:
+            return None
+
+        q1, med, q3 = np.percentile(arr, [25, 50, 75])
+        iqr = q3 - q1
+        lo_limit, hi_limit = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        # Whiskers reach the most extreme data points inside 1.5 * IQR, as in Axes.boxplot
+        return {
+            "label": str(column),
+            "med": med,
+            "q1": q1,
+            "q3": q3,
+            "whislo": arr[arr >= lo_limit].min(),
+            "whishi": arr[arr <= hi_limit].max(),
+            "fliers": arr[(arr < lo_limit) | (arr > hi_limit)],
+        }
+
+    def _sample_positions(self, num_rows: int) -> Optional[np.ndarray]:
+        """Sorted random row positions to plot, or None when every row fits under max_plot_points"""
+        max_points = self.config["max_plot_points"]
+        if not max_points or num_rows <= max_points:
+            return None
+        rng = np.random.default_rng(0)
+        return np.sort(rng.choice(num_rows, size=max_points, replace=False))
+
+    def _use_datashader(self) -> bool:
+        return (self.config["backend"] == "datashader" and ds is not None
+                and len(self.df) > self.config["datashader_threshold"])
+
+    def _rasterize(self, ax, x: np.ndarray, y: np.ndarray, glyph: str):
+        """Aggregate points or a line with datashader and draw the shaded image"""
+        data = pd.DataFrame({"x": x, "y": y}).dropna()
+        x_range = (float(data["x"].min()), float(data["x"].max()))
+        y_range = (float(data["y"].min()), float(data["y"].max()))
+        width, height = self.config["raster_size"]
+        canvas = ds.Canvas(plot_width=width, plot_height=height, x_range=x_range, y_range=y_range)
+        if glyph == "line":
+            agg = canvas.line(data, "x", "y")
+        else:
+            agg = canvas.points(data, "x", "y")
+        img = tf.shade(agg, how="eq_hist")
+        ax.imshow(img.to_pil(), extent=[*x_range, *y_range], aspect="auto")
+
+    def _get_axes(self, figsize):
+        """Return the shared figure and axes, cleared and resized for the next chart"""
+        if self._fig is None:
+            self._fig, self._ax = plt.subplots(figsize=figsize, dpi=self.config["dpi"])
+        else:
+            self._ax.cla()
+            # cla() keeps the aspect ratio and frame that pie charts turn off
+            self._ax.set_aspect("auto")
+            self._ax.set_frame_on(True)
+            self._fig.set_size_inches(figsize)
+        return self._fig, self._ax
+
+    def _export_figure(self, fig, file_path: str):
+        """Save the figure, encoding PNGs straight from the Agg buffer"""
+        if self.config["export_format"].lower() != "png":
+            fig.savefig(file_path)  # dpi and bbox come from _rc_params()
+            _log_export(file_path)
+            return
+        # The layout is already tight, so render once and skip savefig's second pass
+        fig.canvas.draw()
+        dpi = (self.config["dpi"],) * 2
+        if self._io_pool is None:
+            _write_png(file_path, np.asarray(fig.canvas.buffer_rgba()), dpi)
+            return
+        # The canvas buffer is reused by the next chart, so hand the writer a copy
+        future = self._io_pool.submit(_write_png, file_path, np.array(fig.canvas.buffer_rgba()), dpi)
+        self._pending_writes[future] = file_path
+
+    @contextmanager
+    def _background_writes(self):
+        """Encode and write PNGs on a thread pool while the next chart renders"""
+        if not self.config["io_workers"]:
+            yield
+            return
+        self._io_pool = ThreadPoolExecutor(max_workers=self.config["io_workers"])
+        self._pending_writes = {}
+        try:
+            yield
+        finally:
+            self._io_pool.shutdown(wait=True)
+            for future, file_path in self._pending_writes.items():
+                if future.exception() is not None:
+                    logger.error(f"Error exporting {file_path}: {future.exception()}")
+            self._io_pool = None
+            self._pending_writes = {}
+
+    def _rc_params(self) -> Dict[str, Any]:
+        """Matplotlib settings applied once around a visualize() run instead of per chart"""
+        return {
+            "savefig.dpi": self.config["dpi"],
+            "savefig.bbox": "tight",
+            "agg.path.chunksize": 10000,  # Split long line paths so Agg renders them faster
+        }
+
+    def _close_figure(self):
+        if self._fig is not None:
+            plt.close(self._fig)
+            self._fig = self._ax = None
+
+    def _scatter_x_column(self, column: str):
+        """Pick the x-axis column for a scatter plot of column, or None if there is none"""
+        numeric_cols = self._numeric_columns
+        if column not in self._numeric_cols:
+            return None
+        if numeric_cols[0] != column:
+            return numeric_cols[0]
+        return numeric_cols[1] if len(numeric_cols) > 1 else self.df.columns[0]
+
+    def _suggest_charts(self, column: str, dtype: str, unique_count: Optional[int]) -> List[str]:
+        """Chart suggestions from the domain rules, capped at max_charts_per_column"""
+        suggestions = self.domain_engine.suggest_chart(column, dtype, unique_count)
+        return suggestions[:self.config["max_charts_per_column"]]
+
+    def _column_frame(self, column: str, unique_count: Optional[int]) -> pd.DataFrame:
+        """Select the columns needed to chart column in a worker process"""
+        # Only numeric columns can be scatter plotted, and their unique count is known here
+        if column not in self._numeric_cols or "scatter" not in self._suggest_charts(column, "numeric", unique_count):
+            return self.df[[column]]
+        x_col = self._scatter_x_column(column)
+        if x_col is None or x_col == column:
+            return self.df[[column]]
+        return self.df[[x_col, column]]
+
     def visualize(self, export: bool = False, output_dir: str = "charts"):
-        if self.df.empty:
+        num_rows, num_cols = self.df.shape
+        if num_rows == 0 or num_cols == 0:
             logger.error("DataFrame is empty. Visualization aborted.")
             return
 
         os.makedirs(output_dir, exist_ok=True)
 
-        for col in self.df.columns:
-            dtype = self.detect_dtype(col)
-            unique_count = self.df[col].nunique()
-            
-            # Get chart suggestions based on domain rules and unique value count
-            suggestions = self.domain_engine.suggest_chart(col, dtype, unique_count)
-            suggestions = suggestions[:self.config["max_charts_per_column"]]
+        self._numeric_cols = self._detect_numeric_columns()
+        self._num_cols = num_cols
+        # Drop cached counts from any earlier call
+        self._value_counts_cache.clear()
+        # Categorical columns get their unique count from value_counts below,
+        # so only numeric columns need a separate nunique pass
+        self._numeric_columns = [col for col in self.df.columns if col in self._numeric_cols]
+        unique_counts = (self.df[self._numeric_columns].nunique(dropna=True).to_dict()
+                         if self._numeric_columns else {})
+
+        if self.config["parallel"]:
+            self._visualize_parallel(unique_counts, export, output_dir)
+            return
 
-            for chart in suggestions:
+        try:
+            with plt.rc_context(self._rc_params()), self._background_writes():
+                for col in self.df.columns:
+                    self._visualize_column(col, unique_counts.get(col), export, output_dir)
+        finally:
+            self._close_figure()
+
+    def _visualize_parallel(self, unique_counts: Dict[str, int], export: bool, output_dir: str):
+        max_workers = self.config["max_workers"] or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_render_column, self._column_frame(col, unique_counts.get(col)), col,
+                                self.domain_engine.domain,
+                                self.config, unique_counts.get(col), export, output_dir): col
+                for col in self.df.columns
+                if unique_counts.get(col, 2) > 1  # Known constant numeric columns are skipped here
+            }
+            for future in as_completed(futures):
                 try:
-                    # Set figure size based on expected number of categories/bars
-                    if chart in ["bar", "pie"] and dtype == "categorical":
-                        # For categorical charts, adjust width based on number of categories
-                        num_categories = min(unique_count, self.config["max_categories"])
-                        fig_width = max(8, num_categories * self.config["figsize_width_multiplier"])
-                        plt.figure(figsize=(fig_width, 6))
-                    else:
-                        plt.figure(figsize=(10, 6))
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error visualizing {futures[future]} in worker process: {e}")
+
+    def _visualize_column(self, col: str, unique_count: Optional[int], export: bool, output_dir: str):
+        dtype = "numeric" if col in self._numeric_cols else "categorical"
+        if dtype == "categorical":
+            # Hash the column once; bar and pie reuse the cached counts
+            unique_count = len(self._value_counts(col))
+
+        if unique_count <= 1:
+            # All-null or constant columns carry no information worth a chart
+            logger.info(f"Skipping constant/empty column {col}")
+            self._value_counts_cache.pop(col, None)
+            return
+        
+        # Get chart suggestions based on domain rules and unique value count
+        suggestions = self._suggest_charts(col, dtype, unique_count)
+        # Format titles once per column; the scatter title is built once its x column is known
+        titles = {chart: _CHART_TITLES[chart].format(col=col)
+                  for chart in suggestions if chart in _CHART_TITLES and chart != "scatter"}
+
+        for chart in suggestions:
+            try:
+                # Set figure size based on expected number of categories/bars
+                if chart in ["bar", "pie"] and dtype == "categorical":
+                    # For categorical charts, adjust width based on number of categories
+                    num_categories = min(unique_count, self.config["max_categories"])
+                    fig_width = max(8, num_categories * self.config["figsize_width_multiplier"])
+                    fig, ax = self._get_axes((fig_width, 6))
+                else:
+                    fig, ax = self._get_axes((10, 6))
+                
+                if chart == "histogram":
+                    arr = self._numeric_values(col)
+                    if arr.size == 0:
+                        logger.warning(f"Skipping histogram for {col}: no non-null values")
+                        continue
+                    counts, edges = np.histogram(arr, bins=min(30, unique_count))
+                    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+                    ax.grid(True)  # Series.hist draws a grid by default
+                    ax.set_title(titles[chart])
+                    ax.set_ylabel("Frequency")
                     
-                    if chart == "histogram":
-                        self.df[col].hist(bins=min(30, unique_count))
-                        plt.title(f"Histogram of {col}")
-                        plt.ylabel("Frequency")
-                        
-                    elif chart == "boxplot":
-                        self.df.boxplot(column=col)
-                        plt.title(f"Boxplot of {col}")
-                        
-                    elif chart == "bar":
-                        # Handle categorical data with many values
-                        data_to_plot, has_other = self._prepare_categorical_data(
-                            col, self.config["max_categories"]
-                        )
-                        
-                        ax = data_to_plot.plot(kind="bar")
-                        plt.title(f"Bar chart of {col}")
-                        plt.ylabel("Count")
-                        
-                        # Rotate labels if they're long or numerous
-                        if len(data_to_plot) > 5:
-                            plt.xticks(rotation=45, ha='right')
-                        
-                        # Add annotation if we've grouped categories
-                        if has_other:
-                            plt.figtext(0.02, 0.02, 
-                                       f"Showing top {self.config['max_categories']-1} categories, rest grouped as 'Other'", 
-                                       fontsize=8, style='italic')
+                elif chart == "boxplot":
+                    stats = self._boxplot_stats(col)
+                    if stats is None:
+                        logger.warning(f"Skipping boxplot for {col}: no non-null values")
+                        continue
+                    ax.bxp([stats])
+                    ax.grid(True)  # DataFrame.boxplot draws a grid by default
+                    ax.set_title(titles[chart])
                     
-                    elif chart == "pie":
-                        # Only create pie charts for reasonable number of categories
-                        if unique_count > 15:
-                            logger.warning(f"Skipping pie chart for {col}: too many categories ({unique_count})")
-                            plt.close()
-                            continue
-                            
-                        data_to_plot, has_other = self._prepare_categorical_data(
-                            col, min(10, self.config["max_categories"])
-                        )
-                        
-                        # Create pie chart
-                        wedges, texts, autotexts = data_to_plot.plot(
-                            kind="pie", 
-                            autopct='%1.1f%%',
-                            startangle=90,
-                            labels=None  # We'll add legend instead for clarity
-                        )
-                        
-                        plt.title(f"Pie chart of {col}")
-                        plt.ylabel("")  # Remove y-label
-                        
-                        # Add legend
-                        plt.legend(wedges, data_to_plot.index,
-                                  title="Categories",
-                                  loc="center left",
-                                  bbox_to_anchor=(1, 0, 0.5, 1))
+                elif chart == "bar":
+                    # Handle categorical data with many values
+                    data_to_plot, has_other = self._prepare_categorical_data(
+                        col, self.config["max_categories"]
+                    )
                     
-                    elif chart == "line":
-                        # For line charts, we need a meaningful x-axis
-                        if self.df.index.dtype.kind in 'biufc':  # numeric index
-                            self.df[col].plot(kind="line")
-                        else:
-                            # Reset index to use numeric x-axis for non-numeric indices
-                            reset_df = self.df.reset_index()
-                            plt.plot(reset_df.index, reset_df[col])
+                    positions = np.arange(len(data_to_plot))
+                    ax.bar(positions, data_to_plot.to_numpy())
+                    ax.set_xticks(positions, labels=[str(label) for label in data_to_plot.index])
+                    ax.set_title(titles[chart])
+                    ax.set_xlabel(str(col))
+                    ax.set_ylabel("Count")
+                    
+                    # Rotate labels if they're long or numerous
+                    if len(data_to_plot) > 5:
+                        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+                    
+                    # Add annotation if we've grouped categories. Attached to the
+                    # axes (in figure coordinates) so cla() clears it for the next chart
+                    if has_other:
+                        ax.text(0.02, 0.02,
+                                f"Showing top {self.config['max_categories']-1} categories, rest grouped as 'Other'",
+                                transform=fig.transFigure, in_layout=False,
+                                fontsize=8, style='italic')
+                
+                elif chart == "pie":
+                    # Only create pie charts for reasonable number of categories
+                    if unique_count > 15:
+                        logger.warning(f"Skipping pie chart for {col}: too many categories ({unique_count})")
+                        continue
                         
-                        plt.title(f"Line chart of {col}")
-                        plt.xlabel("Index")
+                    data_to_plot, has_other = self._prepare_categorical_data(
+                        col, min(10, self.config["max_categories"])
+                    )
+                    
+                    # Create pie chart
+                    wedges, texts, autotexts = ax.pie(
+                        data_to_plot.to_numpy(),
+                        autopct='%1.1f%%',
+                        startangle=90,
+                        labels=None  # We'll add legend instead for clarity
+                    )
+                    
+                    ax.set_title(titles[chart])
                     
-                    elif chart == "scatter":
-                        if len(self.df.columns) > 1:
-                            # Find a suitable numeric column for x-axis
-                            numeric_cols = self.df.select_dtypes(include=np.number).columns.tolist()
-                            if numeric_cols and col in numeric_cols:
-                                x_col = numeric_cols[0] if numeric_cols[0] != col else numeric_cols[1] if len(numeric_cols) > 1 else self.df.columns[0]
-                                self.df.plot(kind="scatter", x=x_col, y=col)
-                                plt.title(f"Scatter plot of {x_col} vs {col}")
+                    # Add legend
+                    ax.legend(wedges, [str(label) for label in data_to_plot.index],
+                              title="Categories",
+                              loc="center left",
+                              bbox_to_anchor=(1, 0, 0.5, 1))
+                
+                elif chart == "line":
+                    # For line charts, we need a meaningful x-axis
+                    if self.df.index.dtype.kind in 'biufc':  # numeric index
+                        x_values = self.df.index.to_numpy()
+                    else:
+                        # Use row positions as x-axis for non-numeric indices
+                        x_values = np.arange(len(self.df))
+                    y_values = self._float_values(col)
+                    if self._use_datashader():
+                        self._rasterize(ax, x_values, y_values, "line")
+                    else:
+                        positions = self._sample_positions(len(y_values))
+                        if positions is not None:
+                            x_values, y_values = x_values[positions], y_values[positions]
+                        ax.plot(x_values, y_values)
+                    
+                    ax.set_title(titles[chart])
+                    ax.set_xlabel("Index")
+                
+                elif chart == "scatter":
+                    if self._num_cols > 1:
+                        # Find a suitable numeric column for x-axis
+                        x_col = self._scatter_x_column(col)
+                        if x_col is not None:
+                            x_values = self._float_values(x_col)
+                            y_values = self._float_values(col)
+                            if self._use_datashader():
+                                self._rasterize(ax, x_values, y_values, "points")
                             else:
-                                logger.warning(f"Scatter plot skipped: no suitable numeric columns in {col}.")
-                                plt.close()
-                                continue
+                                # Sample the same rows for both axes
+                                positions = self._sample_positions(len(y_values))
+                                if positions is not None:
+                                    x_values, y_values = x_values[positions], y_values[positions]
+                                ax.scatter(x_values, y_values)
+                            ax.set_xlabel(str(x_col))
+                            ax.set_ylabel(str(col))
+                            ax.set_title(_CHART_TITLES["scatter"].format(x_col=x_col, col=col))
                         else:
-                            logger.warning(f"Scatter plot skipped: not enough columns in {col}.")
-                            plt.close()
+                            logger.warning(f"Scatter plot skipped: no suitable numeric columns in {col}.")
                             continue
+                    else:
+                        logger.warning(f"Scatter plot skipped: not enough columns in {col}.")
+                        continue
 
-                    # Improve layout to prevent label cutoff
-                    plt.tight_layout()
-                    
-                    if export:
-                        file_path = os.path.join(output_dir, f"{col}_{chart}.{self.config['export_format']}")
-                        plt.savefig(file_path, dpi=self.config["dpi"], bbox_inches='tight')
-                        logger.info(f"Exported {file_path}")
-                    
-                    plt.close()
-                    
-                except Exception as e:
-                    logger.error(f"Error visualizing {col} with {chart}: {e}")
-                    plt.close()
\ No newline at end of file
+                # Improve layout to prevent label cutoff
+                fig.tight_layout()
+                
+                if export:
+                    file_path = os.path.join(output_dir, f"{col}_{chart}.{self.config['export_format']}")
+                    self._export_figure(fig, file_path)
+                
+            except Exception as e:
+                logger.error(f"Error visualizing {col} with {chart}: {e}")
+
+        # Counts are only shared between the charts of one column; free them so
+        # high-cardinality columns don't pile up in memory
+        self._value_counts_cache.pop(col, None)
+
+
+def _log_export(file_path: str):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Exported {file_path}")
+
+
+def _write_png(file_path: str, rgba: np.ndarray, dpi: tuple):
+    """Encode an RGBA buffer as PNG; run on the I/O thread pool when background writes are on"""
+    Image.fromarray(rgba).save(file_path, compress_level=1, dpi=dpi)
+    _log_export(file_path)
+
+
+def _render_column(df: pd.DataFrame, column: str, domain: str, config: Dict[str, Any],
+                   unique_count: Optional[int], export: bool, output_dir: str):
+    """Process pool entry point: draw every chart for a single column"""
+    vis = AutoVisualizer(df, domain, {**config, "optimize_dtypes": False, "parallel": False})
+    vis._numeric_cols = vis._detect_numeric_columns()
+    vis._numeric_columns = [col for col in vis.df.columns if col in vis._numeric_cols]
+    vis._num_cols = vis.df.shape[1]
+    try:
+        with plt.rc_context(vis._rc_params()), vis._background_writes():
+            vis._visualize_column(column, unique_count, export, output_dir)
+    finally:
+        vis._close_figure()